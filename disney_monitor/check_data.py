@@ -8,8 +8,7 @@ import os
 import sys
 from datetime import datetime
 import pandas as pd
-
-CSV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wait_times.csv")
+from wait_data import DATA_FILE as CSV_FILE, load_wait_times
 
 def show_recent_data(limit=10):
     """显示最近的数据记录"""
@@ -21,6 +20,7 @@ def show_recent_data(limit=10):
         # 使用pandas读取数据（如果可用）
         try:
             import pandas as pd
+            # 这里要显示项目ID等全部列，所以不走只读分析列的 load_wait_times()
             df = pd.read_csv(CSV_FILE)
             print(f"数据文件: {CSV_FILE}")
             print(f"总记录数: {len(df)}")
@@ -29,15 +29,15 @@ def show_recent_data(limit=10):
             
             print("\n最近记录:")
             recent = df.tail(limit)
-            for _, row in recent.iterrows():
-                status = "✅ 开放" if row['is_open'] else "❌ 关闭"
-                print(f"{row['timestamp_local']} - {row['chinese_name']}: {row['wait_time']}分钟 {status}")
+            for row in recent.itertuples(index=False):
+                status = "✅ 开放" if row.is_open else "❌ 关闭"
+                print(f"{row.timestamp_local} - {row.chinese_name}: {row.wait_time}分钟 {status}")
             
             print("\n各项目最新状态:")
             latest = df.sort_values('timestamp_local').groupby('chinese_name').last().reset_index()
-            for _, row in latest.iterrows():
-                status = "✅ 开放" if row['is_open'] else "❌ 关闭"
-                print(f"{row['chinese_name']}: {row['wait_time']}分钟 {status}")
+            for row in latest.itertuples(index=False):
+                status = "✅ 开放" if row.is_open else "❌ 关闭"
+                print(f"{row.chinese_name}: {row.wait_time}分钟 {status}")
                 
         except ImportError:
             # 回退到纯CSV读取
@@ -62,11 +62,7 @@ def show_summary():
         return
     
     try:
-        import pandas as pd
-        df = pd.read_csv(CSV_FILE)
-        
-        # 转换为datetime
-        df['timestamp'] = pd.to_datetime(df['timestamp_local'])
+        df = load_wait_times()
         
         print("=== 迪士尼排队监测数据摘要 ===")
         print(f"数据文件: {CSV_FILE}")
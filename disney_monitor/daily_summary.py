@@ -5,16 +5,17 @@
 """
 
 import csv
+import heapq
 import os
 import sys
 from datetime import datetime
-import pandas as pd
+from operator import itemgetter
 import json
+from wait_data import DATA_DIR, DATA_FILE, load_wait_times
 
-DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wait_times.csv")
-OUTPUT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "daily_summary.txt")
-OUTPUT_HTML = os.path.join(os.path.dirname(os.path.abspath(__file__)), "daily_summary.html")
-TEMPLATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "report_template.html")
+OUTPUT_FILE = os.path.join(DATA_DIR, "daily_summary.txt")
+OUTPUT_HTML = os.path.join(DATA_DIR, "daily_summary.html")
+TEMPLATE_FILE = os.path.join(DATA_DIR, "templates", "report_template.html")
 
 def load_data():
     """加载CSV数据"""
@@ -23,12 +24,7 @@ def load_data():
         return None
     
     try:
-        df = pd.read_csv(DATA_FILE)
-        # 转换时间戳
-        df['timestamp'] = pd.to_datetime(df['timestamp_local'])
-        df['date'] = df['timestamp'].dt.date
-        df['hour'] = df['timestamp'].dt.hour
-        return df
+        return load_wait_times()
     except Exception as e:
         print(f"加载数据失败: {e}")
         return None
@@ -49,13 +45,11 @@ def generate_daily_summary(df):
     report_lines.append(f"监测项目数: {df['chinese_name'].nunique()}")
     report_lines.append("")
     
-    # 按日期分析
-    dates = sorted(df['date'].unique())
+    # 按日期分析（groupby按日期、项目名排序分组，每条记录只遍历一次）
     report_lines.append("📅 按日期汇总:")
     report_lines.append("-" * 40)
     
-    for date in dates:
-        date_data = df[df['date'] == date]
+    for date, date_data in df.groupby('date'):
         date_str = date.strftime('%Y-%m-%d')
         report_lines.append(f"\n📆 {date_str}:")
         
@@ -64,8 +58,7 @@ def generate_daily_summary(df):
         report_lines.append(f"  总记录数: {total_records}")
         
         # 按项目分析
-        for name in sorted(date_data['chinese_name'].unique()):
-            project_data = date_data[date_data['chinese_name'] == name]
+        for name, project_data in date_data.groupby('chinese_name'):
             open_data = project_data[project_data['is_open'] == True]
             
             if len(open_data) > 0:
@@ -87,27 +80,28 @@ def generate_daily_summary(df):
     report_lines.append("📊 各项目总体统计:")
     report_lines.append("-" * 40)
     
-    for name in sorted(df['chinese_name'].unique()):
-        project_data = df[df['chinese_name'] == name]
-        open_data = project_data[project_data['is_open'] == True]
+    # 各项目统计一次聚合完成，总体统计和游玩建议两处共用
+    open_df = df[df['is_open'] == True]
+    record_counts = df['chinese_name'].value_counts()
+    open_stats = open_df.groupby('chinese_name')['wait_time'].agg(['mean', 'max', 'size', 'idxmax'])
+    
+    for name in sorted(record_counts.index):
+        total_count = record_counts[name]
         
-        if len(open_data) > 0:
-            avg_wait = open_data['wait_time'].mean()
-            max_wait = open_data['wait_time'].max()
-            open_rate = len(open_data) / len(project_data) * 100
+        if name in open_stats.index:
+            avg_wait = open_stats.at[name, 'mean']
+            max_wait = open_stats.at[name, 'max']
+            open_count = open_stats.at[name, 'size']
+            open_rate = open_count / total_count * 100
             
             # 找到峰值时间
-            if len(open_data) > 0:
-                peak_time_data = open_data.loc[open_data['wait_time'].idxmax()]
-                peak_time = peak_time_data['timestamp'].strftime('%Y-%m-%d %H:%M')
-                peak_wait = peak_time_data['wait_time']
-            else:
-                peak_time = "N/A"
-                peak_wait = 0
+            peak_idx = open_stats.at[name, 'idxmax']
+            peak_time = df.at[peak_idx, 'timestamp'].strftime('%Y-%m-%d %H:%M')
+            peak_wait = df.at[peak_idx, 'wait_time']
             
             report_lines.append(f"🎢 {name}:")
-            report_lines.append(f"  总记录数: {len(project_data)}")
-            report_lines.append(f"  开放率: {open_rate:.1f}% ({len(open_data)}/{len(project_data)})")
+            report_lines.append(f"  总记录数: {total_count}")
+            report_lines.append(f"  开放率: {open_rate:.1f}% ({open_count}/{total_count})")
             report_lines.append(f"  平均等待: {avg_wait:.1f}分钟")
             report_lines.append(f"  最长等待: {max_wait}分钟")
             report_lines.append(f"  峰值时间: {peak_time} ({peak_wait}分钟)")
@@ -120,9 +114,8 @@ def generate_daily_summary(df):
     report_lines.append("-" * 40)
     
     # 按小时分析平均等待时间
-    if len(df[df['is_open'] == True]) > 0:
-        open_data = df[df['is_open'] == True]
-        hourly_stats = open_data.groupby('hour')['wait_time'].agg(['mean', 'max', 'count']).round(1)
+    if len(open_df) > 0:
+        hourly_stats = open_df.groupby('hour')['wait_time'].agg(['mean', 'max', 'count']).round(1)
         
         report_lines.append("\n按小时平均等待时间:")
         for hour in sorted(hourly_stats.index):
@@ -136,37 +129,32 @@ def generate_daily_summary(df):
     report_lines.append("💡 游玩建议:")
     report_lines.append("-" * 40)
     
-    if len(df[df['is_open'] == True]) > 0:
-        open_data = df[df['is_open'] == True]
-        
+    if len(open_df) > 0:
         # 找到平均等待时间最低的小时
-        if not open_data.empty:
-            best_hour = open_data.groupby('hour')['wait_time'].mean().idxmin()
-            best_avg = open_data.groupby('hour')['wait_time'].mean().min()
+        if not open_df.empty:
+            hourly_mean = open_df.groupby('hour')['wait_time'].mean()
+            best_hour = hourly_mean.idxmin()
+            best_avg = hourly_mean.min()
             report_lines.append(f"建议游玩时间: {best_hour:02d}:00 左右")
             report_lines.append(f"理由: 该时段平均等待时间最低 ({best_avg:.1f}分钟)")
             
         # 找到最佳项目（平均等待时间最短且开放率高的项目）
         project_stats = []
         for name in df['chinese_name'].unique():
-            project_data = df[df['chinese_name'] == name]
-            open_data = project_data[project_data['is_open'] == True]
-            
-            if len(open_data) > 0:
-                avg_wait = open_data['wait_time'].mean()
-                open_rate = len(open_data) / len(project_data) * 100
+            if name in open_stats.index:
+                open_count = open_stats.at[name, 'size']
                 project_stats.append({
                     'name': name,
-                    'avg_wait': avg_wait,
-                    'open_rate': open_rate,
-                    'record_count': len(open_data)
+                    'avg_wait': open_stats.at[name, 'mean'],
+                    'open_rate': open_count / record_counts[name] * 100,
+                    'record_count': open_count
                 })
         
         if project_stats:
-            # 按平均等待时间排序
-            project_stats.sort(key=lambda x: x['avg_wait'])
+            # 只需平均等待时间最短的前3个项目，无需整体排序
+            friendliest = heapq.nsmallest(3, project_stats, key=itemgetter('avg_wait'))
             report_lines.append(f"\n排队最友好的项目:")
-            for i, stats in enumerate(project_stats[:3]):
+            for i, stats in enumerate(friendliest):
                 report_lines.append(f"  {i+1}. {stats['name']}: 平均{stats['avg_wait']:.1f}分钟 (开放率{stats['open_rate']:.1f}%)")
     else:
         report_lines.append("暂无足够数据提供游玩建议")
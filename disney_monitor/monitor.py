@@ -33,11 +33,12 @@ TOP_ATTRACTIONS = [
     {"id": 8005, "name": "Haunted Mansion", "chinese_name": "幽灵公馆"}
 ]
 
-def is_within_monitor_hours():
+def is_within_monitor_hours(now=None):
     """检查当前时间是否在监测时段内"""
     # 获取Asia/Shanghai当前时间
     # 注意: datetime.now()默认是本地时间，如果系统时区设置正确就是上海时间
-    now = datetime.now()
+    if now is None:
+        now = datetime.now()
     current_hour = now.hour
     
     # 检查是否在监测时段内
@@ -57,8 +58,8 @@ def fetch_wait_times():
         
         req = urllib.request.Request(DATA_URL, headers=headers)
         with urllib.request.urlopen(req, timeout=10) as response:
-            data = response.read().decode('utf-8')
-            return json.loads(data)
+            # json.loads直接接受UTF-8字节，省去先整体decode成str的一次拷贝
+            return json.loads(response.read())
     except urllib.error.URLError as e:
         print(f"网络错误: {e}")
         return None
@@ -111,37 +112,36 @@ def save_to_csv(attractions_data):
     # 检查文件是否存在，如果不存在则创建并写入表头
     file_exists = os.path.exists(CSV_FILE)
     
-    # 当前时间戳
-    timestamp = datetime.now(timezone.utc).isoformat()
-    local_time = datetime.now().isoformat()
+    # 当前时间戳（只取一次时间，UTC与本地时间对应同一时刻）
+    now = datetime.now(timezone.utc)
+    timestamp = now.isoformat()
+    local_time = now.astimezone().replace(tzinfo=None).isoformat()
     
     with open(CSV_FILE, 'a', newline='', encoding='utf-8') as csvfile:
         fieldnames = ['timestamp_utc', 'timestamp_local', 'attraction_id', 'attraction_name', 
                      'chinese_name', 'wait_time', 'is_open', 'last_updated']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.writer(csvfile)
         
         if not file_exists:
-            writer.writeheader()
+            writer.writerow(fieldnames)
         
-        for attraction in attractions_data:
-            writer.writerow({
-                'timestamp_utc': timestamp,
-                'timestamp_local': local_time,
-                'attraction_id': attraction['id'],
-                'attraction_name': attraction['name'],
-                'chinese_name': attraction['chinese_name'],
-                'wait_time': attraction['wait_time'],
-                'is_open': attraction['is_open'],
-                'last_updated': attraction['last_updated']
-            })
+        # 按fieldnames顺序构造行，一次性批量写入
+        writer.writerows(
+            [timestamp, local_time, attraction['id'], attraction['name'],
+             attraction['chinese_name'], attraction['wait_time'],
+             attraction['is_open'], attraction['last_updated']]
+            for attraction in attractions_data
+        )
     
     print(f"数据已保存到 {CSV_FILE}")
 
 def main():
-    print(f"开始获取东京迪士尼乐园排队数据... (时间: {datetime.now().isoformat()})")
+    # 本次运行的开始时间只取一次，启动日志和时段检查共用
+    started_at = datetime.now()
+    print(f"开始获取东京迪士尼乐园排队数据... (时间: {started_at.isoformat()})")
     
     # 检查是否在监测时段内
-    if not is_within_monitor_hours():
+    if not is_within_monitor_hours(started_at):
         print(f"跳过执行: 当前时间不在监测时段内 ({MONITOR_START_HOUR}:00-{MONITOR_END_HOUR}:00)")
         sys.exit(0)
     
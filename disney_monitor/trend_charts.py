@@ -13,12 +13,12 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.patches import Rectangle
 import warnings
+from wait_data import DATA_DIR, DATA_FILE, load_wait_times
 warnings.filterwarnings('ignore')
 
 # 配置
-DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wait_times.csv")
-CHARTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "charts")
-OUTPUT_REPORT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "trend_report.txt")
+CHARTS_DIR = os.path.join(DATA_DIR, "charts")
+OUTPUT_REPORT = os.path.join(DATA_DIR, "trend_report.txt")
 
 # 颜色配置
 COLORS = {
@@ -53,30 +53,26 @@ def load_and_prepare_data():
         return None
     
     try:
-        df = pd.read_csv(DATA_FILE)
+        df = load_wait_times()
         
         if len(df) == 0:
             print("数据文件为空")
             return None
         
-        # 转换时间戳
-        df['timestamp'] = pd.to_datetime(df['timestamp_local'])
-        
         # 提取日期和时间信息
-        df['date'] = df['timestamp'].dt.date
         df['year'] = df['timestamp'].dt.year
         df['month'] = df['timestamp'].dt.month
         df['day'] = df['timestamp'].dt.day
-        df['hour'] = df['timestamp'].dt.hour
         df['minute'] = df['timestamp'].dt.minute
         df['weekday'] = df['timestamp'].dt.weekday  # 0=星期一, 6=星期日
         df['is_weekend'] = df['weekday'].isin([5, 6])  # 星期六、星期日
         
-        # 计算时间段的标签
-        df['time_period'] = df['hour'].apply(lambda x: get_time_period(x))
+        # 计算时间段的标签（小时最多24种取值，每种只调用一次get_time_period）
+        period_labels = {hour: get_time_period(hour) for hour in df['hour'].unique()}
+        df['time_period'] = df['hour'].map(period_labels)
         
         # 只保留开放时的数据用于分析
-        open_df = df[df['is_open'] == True].copy()
+        open_df = df[df['is_open'] == True]
         
         print(f"数据加载成功: {len(df)} 条记录, {len(open_df)} 条开放记录")
         print(f"时间范围: {df['timestamp'].min()} 到 {df['timestamp'].max()}")
@@ -114,8 +110,7 @@ def generate_time_series_charts(df, open_df):
     
     # 1. 整体时间序列图
     ax = axes[0, 0]
-    for attraction in open_df['chinese_name'].unique():
-        attr_data = open_df[open_df['chinese_name'] == attraction].copy()
+    for attraction, attr_data in open_df.groupby('chinese_name', sort=False):
         if len(attr_data) > 1:
             attr_data = attr_data.sort_values('timestamp')
             ax.plot(attr_data['timestamp'], attr_data['wait_time'], 
@@ -152,21 +147,20 @@ def generate_time_series_charts(df, open_df):
     
     # 3. 工作日 vs 周末对比
     ax = axes[1, 0]
-    weekday_data = open_df[open_df['is_weekend'] == False]
-    weekend_data = open_df[open_df['is_weekend'] == True]
+    # 按 (项目, 是否周末) 一次分组，列为 False=工作日 / True=周末
+    weekpart = open_df.groupby(['chinese_name', 'is_weekend'])['wait_time']
+    weekpart_means = weekpart.mean().unstack().reindex(columns=[False, True])
+    weekpart_counts = weekpart.size().unstack(fill_value=0).reindex(columns=[False, True], fill_value=0)
     
     categories = []
     weekday_means = []
     weekend_means = []
     
     for attraction in open_df['chinese_name'].unique():
-        wk_data = weekday_data[weekday_data['chinese_name'] == attraction]
-        we_data = weekend_data[weekend_data['chinese_name'] == attraction]
-        
-        if len(wk_data) > 0 and len(we_data) > 0:
+        if weekpart_counts.at[attraction, False] > 0 and weekpart_counts.at[attraction, True] > 0:
             categories.append(attraction[:8] + '...' if len(attraction) > 8 else attraction)
-            weekday_means.append(wk_data['wait_time'].mean())
-            weekend_means.append(we_data['wait_time'].mean())
+            weekday_means.append(weekpart_means.at[attraction, False])
+            weekend_means.append(weekpart_means.at[attraction, True])
     
     if categories:
         x = np.arange(len(categories))
@@ -261,11 +255,8 @@ def generate_individual_attraction_charts(open_df):
         print("数据不足，无法生成单独项目图表")
         return False
     
-    attractions = open_df['chinese_name'].unique()
-    
-    for attraction in attractions:
-        attr_data = open_df[open_df['chinese_name'] == attraction].copy()
-        
+    # 按项目一次性分组，避免每个项目都对全表做一次布尔筛选
+    for attraction, attr_data in open_df.groupby('chinese_name', sort=False):
         if len(attr_data) < 3:
             continue
         
@@ -379,8 +370,9 @@ def generate_recommendation_report(df, open_df):
     
     # 最佳游玩时间（平均等待最短的小时）
     if open_df['hour'].nunique() > 0:
-        best_hour = open_df.groupby('hour')['wait_time'].mean().idxmin()
-        best_avg = open_df.groupby('hour')['wait_time'].mean().min()
+        hourly_mean = open_df.groupby('hour')['wait_time'].mean()
+        best_hour = hourly_mean.idxmin()
+        best_avg = hourly_mean.min()
         report_lines.append(f"• 最佳游玩时段: {best_hour:02d}:00 左右")
         report_lines.append(f"  理由: 该时段平均等待时间最低 ({best_avg:.1f}分钟)")
     
@@ -404,16 +396,19 @@ def generate_recommendation_report(df, open_df):
     report_lines.append("🎢 各项目游玩建议:")
     report_lines.append("-" * 40)
     
-    for attraction in open_df['chinese_name'].unique():
-        attr_data = open_df[open_df['chinese_name'] == attraction].copy()
-        
+    # 按项目分组一次，供各项目建议和游玩顺序两处复用
+    attraction_groups = open_df.groupby('chinese_name', sort=False)
+    
+    for attraction, attr_data in attraction_groups:
         if len(attr_data) >= 3:
             # 最佳游玩时间
             if attr_data['hour'].nunique() > 0:
-                best_hour = attr_data.groupby('hour')['wait_time'].mean().idxmin()
-                best_avg = attr_data.groupby('hour')['wait_time'].mean().min()
-                worst_hour = attr_data.groupby('hour')['wait_time'].mean().idxmax()
-                worst_avg = attr_data.groupby('hour')['wait_time'].mean().max()
+                # 按小时均值只计算一次，最佳/最差时段都从中取
+                hourly_mean = attr_data.groupby('hour')['wait_time'].mean()
+                best_hour = hourly_mean.idxmin()
+                best_avg = hourly_mean.min()
+                worst_hour = hourly_mean.idxmax()
+                worst_avg = hourly_mean.max()
                 
                 report_lines.append(f"• {attraction}:")
                 report_lines.append(f"  最佳时间: {best_hour:02d}:00 (平均{best_avg:.1f}分钟)")
@@ -425,13 +420,13 @@ def generate_recommendation_report(df, open_df):
     report_lines.append("🔄 推荐游玩顺序:")
     report_lines.append("-" * 40)
     
-    # 按平均等待时间排序
+    # 按平均等待时间排序（各项目总记录数一次统计好，不再逐项目筛选全表）
+    record_counts = df['chinese_name'].value_counts()
     attraction_stats = []
-    for attraction in open_df['chinese_name'].unique():
-        attr_data = open_df[open_df['chinese_name'] == attraction].copy()
+    for attraction, attr_data in attraction_groups:
         if len(attr_data) >= 2:
             avg_wait = attr_data['wait_time'].mean()
-            open_rate = len(attr_data) / len(df[df['chinese_name'] == attraction]) * 100
+            open_rate = len(attr_data) / record_counts[attraction] * 100
             attraction_stats.append({
                 'name': attraction,
                 'avg_wait': avg_wait,
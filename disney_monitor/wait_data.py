@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+迪士尼排队数据读取公共模块
+check_data / daily_summary / trend_charts 共用的CSV加载与时间字段预处理
+"""
+
+import os
+import pandas as pd
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(DATA_DIR, "wait_times.csv")
+
+# 汇总/趋势分析实际用到的列，其余列(UTC时间、项目ID、英文名等)不读入
+ANALYSIS_COLUMNS = ['timestamp_local', 'chinese_name', 'wait_time', 'is_open']
+
+def load_wait_times():
+    """读取CSV数据并解析时间戳，附加 timestamp/date/hour 列"""
+    df = pd.read_csv(DATA_FILE, usecols=ANALYSIS_COLUMNS)
+    # 转换时间戳: timestamp_local 均为 datetime.isoformat() 输出，指定ISO8601免去格式推断，空值仍得到NaT
+    df['timestamp'] = pd.to_datetime(df['timestamp_local'], format='ISO8601')
+    df['date'] = df['timestamp'].dt.date
+    df['hour'] = df['timestamp'].dt.hour
+    return df